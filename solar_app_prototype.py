@@ -1,9 +1,8 @@
+import sys
+
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 
 # Page configuration
 st.set_page_config(
@@ -13,8 +12,10 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for better styling
-st.markdown("""
+# Custom CSS for better styling. Streamlit drops any element that a rerun
+# does not re-emit, so the static HTML blocks are written on every rerun;
+# the frontend skips re-rendering them because their deltas are unchanged.
+APP_CSS = """
 <style>
     .main-header {
         text-align: center;
@@ -39,7 +40,23 @@ st.markdown("""
         margin: 1rem 0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+HEADER_HTML = """
+<div class="main-header">
+    <h1>☀️ SolarSize Nigeria</h1>
+    <p>Calculate Your Solar Power Needs & Find the Right System</p>
+</div>
+"""
+
+FOOTER_HTML = """
+<div style='text-align: center; color: #666;'>
+    <p>SolarSize Nigeria - Empowering Solar Adoption Across Nigeria</p>
+    <p>Contact: amahagodspower@gmail.com | +234 7016323808 |+234-800-SOLAR-NG</p>
+</div>
+"""
+
+st.markdown(APP_CSS, unsafe_allow_html=True)
 
 # Common appliances database with typical power consumption
 APPLIANCES_DB = {
@@ -106,19 +123,105 @@ VENDORS = {
     ]
 }
 
+# Canonical appliance names, interned so session-state keys reuse one object per name
+APPLIANCE_NAMES = tuple(sys.intern(name) for name in APPLIANCES_DB)
+APPLIANCE_INDEX = {name: i for i, name in enumerate(APPLIANCE_NAMES)}
+
+# Service types offered in vendor search and registration
+VENDOR_SPECIALITIES = ["Residential", "Commercial", "Off-grid Systems", "Hybrid Systems"]
+
+PRIORITY_LEVELS = ["High", "Medium", "Low"]
+
+# Integer codes stored with each appliance; scenarios test them as bitmasks (1 << code)
+PRIORITY_CODES = {"High": 0, "Medium": 1, "Low": 2, "Remove": 3}
+
+def _widget_key(prefix, appliance):
+    """Compact widget key: database index for common appliances, name for custom ones"""
+    idx = APPLIANCE_INDEX.get(appliance)
+    return f"{prefix}_{idx}" if idx is not None else f"{prefix}_custom_{appliance}"
+
+@st.cache_resource
+def _appliance_arrays():
+    """Common appliances as parallel arrays: names, power, hours, priority codes"""
+    names = np.array(APPLIANCE_NAMES)
+    power = np.array([d['power'] for d in APPLIANCES_DB.values()], dtype=np.int64)
+    hours = np.array([d['hours'] for d in APPLIANCES_DB.values()], dtype=np.float64)
+    priority = np.array([PRIORITY_CODES[d['priority']] for d in APPLIANCES_DB.values()], dtype=np.int8)
+    
+    # Shared across sessions, so guard against accidental in-place edits
+    for arr in (names, power, hours, priority):
+        arr.setflags(write=False)
+    return names, power, hours, priority
+
+@st.cache_resource
+def _panel_arrays():
+    """Solar panels as parallel arrays: names, watts, price, efficiency, warranty, cost per watt"""
+    names = np.array(list(SOLAR_PANELS.keys()))
+    watts = np.array([d['watts'] for d in SOLAR_PANELS.values()], dtype=np.float64)
+    price = np.array([d['price'] for d in SOLAR_PANELS.values()], dtype=np.float64)
+    efficiency = np.array([d['efficiency'] for d in SOLAR_PANELS.values()], dtype=np.int64)
+    warranty = np.array([d['warranty'] for d in SOLAR_PANELS.values()], dtype=np.int64)
+    cost_per_watt = np.round(price / watts, 2)
+    
+    for arr in (names, watts, price, efficiency, warranty, cost_per_watt):
+        arr.setflags(write=False)
+    return names, watts, price, efficiency, warranty, cost_per_watt
+
+def _sum_load_numpy(power_qty, hours):
+    """Total watts and daily kWh over aligned (power*qty, hours) arrays"""
+    return power_qty.sum(), (power_qty * hours).sum() / 1000
+
+@st.cache_resource
+def _get_sum_load():
+    """Build and warm the load reduction once per process (JIT-compiled if Numba is available)"""
+    # Imported lazily so pages that never sum a load skip the import and compile
+    try:
+        from numba import njit
+    except ImportError:  # Numba is optional; fall back to plain NumPy
+        return _sum_load_numpy
+    
+    @njit
+    def _sum_load_jit(power_qty, hours):
+        total_watts = 0.0
+        total_wh = 0.0
+        for i in range(power_qty.shape[0]):
+            total_watts += power_qty[i]
+            total_wh += power_qty[i] * hours[i]
+        return total_watts, total_wh / 1000.0
+    
+    _sum_load_jit(np.zeros(1), np.zeros(1))
+    return _sum_load_jit
+
+@st.cache_resource
+def _vendors_by_city_spec():
+    """Index vendors as city -> service type -> vendor list ("All" included)"""
+    return {
+        city: {"All": vendors, **{spec: [v for v in vendors if v['speciality'] == spec]
+                                  for spec in VENDOR_SPECIALITIES}}
+        for city, vendors in VENDORS.items()
+    }
+
+def _vendor_view(city, service_type):
+    """Display-ready (name, rating, phone, speciality, stars) rows for a vendor search"""
+    return [
+        (v['name'], v['rating'], v['phone'], v['speciality'], '⭐' * int(v['rating']))
+        for v in _vendors_by_city_spec().get(city, {}).get(service_type, [])
+    ]
+
+def _load_arrays(appliances_data):
+    """Build aligned (power*qty, hours) arrays in a single pass over appliances_data"""
+    table = np.array(
+        [(d['power'] * d['quantity'], d['hours']) for d in appliances_data.values()],
+        dtype=np.float64
+    ).reshape(-1, 2)
+    power_qty, hours = np.ascontiguousarray(table.T)
+    return power_qty, hours
+
 def calculate_daily_consumption(appliances_data):
     """Calculate total daily energy consumption"""
-    total_watts = 0
-    total_kwh = 0
-    
-    for appliance, data in appliances_data.items():
-        if data['quantity'] > 0:
-            watts = data['power'] * data['quantity']
-            kwh = (watts * data['hours']) / 1000
-            total_watts += watts
-            total_kwh += kwh
+    total_watts, total_kwh = _get_sum_load()(*_load_arrays(appliances_data))
     
-    return total_watts, total_kwh
+    return float(total_watts), float(total_kwh)
 
 def calculate_solar_system(daily_kwh, location, autonomy_days=2):
     """Calculate required solar system size"""
@@ -135,39 +238,139 @@ def calculate_solar_system(daily_kwh, location, autonomy_days=2):
     
     return required_solar_kwp, battery_kwh, solar_irradiance
 
+def calculate_system(appliances_data, location, autonomy_days=2):
+    """Calculate daily consumption and the solar system it requires"""
+    total_watts, total_kwh = calculate_daily_consumption(appliances_data)
+    
+    required_kwp, battery_kwh, solar_irradiance = calculate_solar_system(
+        total_kwh, location, autonomy_days
+    )
+    
+    return total_watts, total_kwh, required_kwp, battery_kwh, solar_irradiance
+
+# Cost assumptions (₦)
+GENERATOR_COST_PER_KWH = 100     # Generator fuel cost replaced by solar
+INVERTER_COST_PER_KW = 200000
+BATTERY_COST_PER_KWH = 150000
+INSTALLATION_RATE = 0.3          # Fraction of panel cost
+
+def _compute_costs(kwh, kwp, battery_kwh, panel_cost):
+    """Estimate system cost breakdown and ROI for a daily load"""
+    inverter_cost = kwp * INVERTER_COST_PER_KW
+    battery_cost = battery_kwh * BATTERY_COST_PER_KWH
+    installation_cost = panel_cost * INSTALLATION_RATE
+    total_cost = panel_cost + inverter_cost + battery_cost + installation_cost
+    monthly_savings = kwh * 30 * GENERATOR_COST_PER_KWH
+    
+    return {
+        'panel': panel_cost,
+        'inverter': inverter_cost,
+        'battery': battery_cost,
+        'installation': installation_cost,
+        'total': total_cost,
+        'monthly_savings': monthly_savings,
+        'payback_months': total_cost / monthly_savings if monthly_savings else float('inf')
+    }
+
 def recommend_panels(required_kwp):
     """Recommend solar panel configuration"""
-    recommendations = []
+    names, watts, price, efficiency, warranty, cost_per_watt = _panel_arrays()
+    
+    num_panels = np.ceil(required_kwp * 1000 / watts).astype(np.int64)
+    total_capacity = num_panels * watts / 1000
+    total_cost = pd.Series(num_panels * price)
     
-    for panel_name, panel_data in SOLAR_PANELS.items():
-        panel_kw = panel_data['watts'] / 1000
-        num_panels = int(np.ceil(required_kwp / panel_kw))
-        total_capacity = num_panels * panel_kw
-        total_cost = num_panels * panel_data['price']
+    return pd.DataFrame({
+        'Panel Type': names,
+        'Number of Panels': num_panels,
+        'Total Capacity (kW)': np.round(total_capacity, 2),
+        'Total Cost (₦)': total_cost.map(lambda cost: f"₦{cost:,.0f}"),
+        'Cost per Watt (₦)': cost_per_watt,
+        'Efficiency (%)': efficiency,
+        'Warranty (Years)': warranty,
+        '_total_cost': total_cost
+    })
+
+# Optimization scenarios as bitmasks over priority codes (High=bit 0, Medium=bit 1, Low=bit 2)
+OPTIMIZATION_SCENARIOS = {
+    "Essential Only (High Priority)": 0b001,
+    "Essential + Important (High + Medium)": 0b011,
+    "All Appliances": 0b111
+}
+
+@st.cache_data(ttl=3600, max_entries=100)
+def _optimization_scenarios(appl_key, max_budget):
+    """Size and cost each optimization scenario for a snapshot of
+    (name, power, hours, quantity, priority_code) tuples"""
+    table = np.array([row[1:] for row in appl_key], dtype=np.float64).reshape(-1, 4)
+    pq = table[:, 0] * table[:, 2]
+    pqh = pq * table[:, 1]
+    priority_bit = np.left_shift(1, table[:, 3].astype(np.int8))
+    
+    results = []
+    for scenario_name, mask_bits in OPTIMIZATION_SCENARIOS.items():
+        mask = ((priority_bit & mask_bits) != 0) & (pq > 0)
         
-        recommendations.append({
-            'Panel Type': panel_name,
-            'Number of Panels': num_panels,
-            'Total Capacity (kW)': round(total_capacity, 2),
-            'Total Cost (₦)': f"₦{total_cost:,.0f}",
-            'Cost per Watt (₦)': round(panel_data['price'] / panel_data['watts'], 2),
-            'Efficiency (%)': panel_data['efficiency'],
-            'Warranty (Years)': panel_data['warranty']
-        })
+        if mask.any():
+            total_kwh = pqh[mask].sum() / 1000
+            required_kwp, battery_kwh, _ = calculate_solar_system(total_kwh, "Lagos")  # Default location
+            
+            # Estimate system cost (panels at a rough ₦300k per kWp)
+            costs = _compute_costs(total_kwh, required_kwp, battery_kwh, required_kwp * 300000)
+            
+            results.append({
+                'Scenario': scenario_name,
+                'Daily kWh': round(total_kwh, 2),
+                'Solar kWp': round(required_kwp, 2),
+                'Est. Cost (₦)': f"₦{costs['total']:,.0f}",
+                'Within Budget': "✅" if costs['total'] <= max_budget else "❌",
+                'Monthly Savings': f"₦{costs['monthly_savings']:,.0f}",
+                '_total_cost': costs['total']
+            })
     
-    return pd.DataFrame(recommendations)
+    return results
+
+@st.cache_resource
+def _plotly():
+    """Import Plotly on first chart build so pages without charts skip it"""
+    import plotly.graph_objects as go
+    return go
+
+def _consumption_pie(df):
+    """Pie chart of daily kWh per appliance"""
+    go = _plotly()
+    fig = go.Figure(data=[go.Pie(labels=df['Appliance'].to_numpy(),
+                                 values=df['Daily kWh'].to_numpy())])
+    fig.update_layout(title="Daily Energy Consumption by Appliance")
+    return fig
+
+def _cost_per_watt_bar(df):
+    """Bar chart comparing panel cost per watt"""
+    go = _plotly()
+    fig = go.Figure(data=[go.Bar(x=df['Panel Type'].to_numpy(),
+                                 y=df['Cost per Watt (₦)'].to_numpy())])
+    fig.update_layout(title="Cost Comparison per Watt",
+                      xaxis_title='Panel Type', yaxis_title='Cost per Watt (₦)')
+    fig.update_xaxes(tickangle=45)
+    return fig
+
+def _scenario_cost_bar(scenarios, costs, max_budget):
+    """Bar chart of system cost per scenario against the budget line"""
+    go = _plotly()
+    fig = go.Figure(data=[go.Bar(x=list(scenarios), y=list(costs))])
+    fig.update_layout(title="System Cost by Scenario")
+    fig.add_hline(y=max_budget, line_dash="dash", line_color="red", 
+                  annotation_text="Budget Limit")
+    return fig
 
 # Initialize session state
 if 'appliances_data' not in st.session_state:
     st.session_state.appliances_data = {}
+if 'deleted' not in st.session_state:
+    st.session_state.deleted = set()
 
 # Header
-st.markdown("""
-<div class="main-header">
-    <h1>☀️ SolarSize Nigeria</h1>
-    <p>Calculate Your Solar Power Needs & Find the Right System</p>
-</div>
-""", unsafe_allow_html=True)
+st.markdown(HEADER_HTML, unsafe_allow_html=True)
 
 # Sidebar navigation
 st.sidebar.title("Navigation")
@@ -186,35 +389,44 @@ if page == "🏠 Load Calculator":
         st.write("**Select from Common Appliances:**")
         selected_appliances = st.multiselect(
             "Choose appliances",
-            list(APPLIANCES_DB.keys()),
+            list(APPLIANCE_NAMES),
             help="Select multiple appliances from the list"
         )
         
         # Add selected appliances to session state
-        for appliance in selected_appliances:
-            if appliance not in st.session_state.appliances_data:
+        names, powers, hours, priorities = _appliance_arrays()
+        for i in np.flatnonzero(np.isin(names, selected_appliances)):
+            appliance = APPLIANCE_NAMES[i]
+            if appliance not in st.session_state.appliances_data and appliance not in st.session_state.deleted:
                 st.session_state.appliances_data[appliance] = {
-                    'power': APPLIANCES_DB[appliance]['power'],
-                    'hours': APPLIANCES_DB[appliance]['hours'],
+                    'power': int(powers[i]),
+                    'hours': float(hours[i]),
                     'quantity': 1,
-                    'priority': APPLIANCES_DB[appliance]['priority']
+                    'priority': PRIORITY_LEVELS[priorities[i]],
+                    'priority_code': int(priorities[i])
                 }
         
+        # Appliances deleted in the editor stay out while still selected;
+        # forget them once deselected so re-selecting adds them back
+        st.session_state.deleted &= set(selected_appliances)
+        
         # Custom appliance section
         st.write("**Add Custom Appliance:**")
         with st.form("custom_appliance"):
             custom_name = st.text_input("Appliance Name")
             custom_power = st.number_input("Power (Watts)", min_value=1, value=100)
             custom_hours = st.number_input("Daily Usage (Hours)", min_value=0.1, value=4.0, step=0.1)
-            custom_priority = st.selectbox("Priority", ["High", "Medium", "Low"])
+            custom_priority = st.selectbox("Priority", PRIORITY_LEVELS)
             
             if st.form_submit_button("Add Custom Appliance"):
+                custom_name = sys.intern(custom_name)
                 if custom_name and custom_name not in st.session_state.appliances_data:
                     st.session_state.appliances_data[custom_name] = {
                         'power': custom_power,
                         'hours': custom_hours,
                         'quantity': 1,
-                        'priority': custom_priority
+                        'priority': custom_priority,
+                        'priority_code': PRIORITY_CODES[custom_priority]
                     }
                     st.success(f"Added {custom_name} to your appliances!")
     
@@ -227,53 +439,84 @@ if page == "🏠 Load Calculator":
             st.metric("Daily Energy", f"{total_kwh:.2f} kWh")
             st.metric("Monthly Energy", f"{total_kwh * 30:.1f} kWh")
             
-            # Estimated monthly cost (assuming ₦100/kWh from generator)
-            monthly_cost = total_kwh * 30 * 100
+            # Estimated monthly cost of running the same load on a generator
+            monthly_cost = total_kwh * 30 * GENERATOR_COST_PER_KWH
             st.metric("Monthly Gen. Cost", f"₦{monthly_cost:,.0f}")
     
     # Appliances configuration
     if st.session_state.appliances_data:
         st.subheader("Configure Your Appliances")
         
-        appliances_df = []
-        for appliance, data in st.session_state.appliances_data.items():
-            col1, col2, col3, col4, col5 = st.columns([3, 1, 1, 1, 1])
-            
-            with col1:
-                st.write(f"**{appliance}**")
-            with col2:
-                quantity = st.number_input(f"Qty", min_value=0, value=data['quantity'], key=f"qty_{appliance}")
-                st.session_state.appliances_data[appliance]['quantity'] = quantity
-            with col3:
-                st.write(f"{data['power']}W")
-            with col4:
-                hours = st.number_input(f"Hours", min_value=0.0, value=float(data['hours']), step=0.1, key=f"hours_{appliance}")
-                st.session_state.appliances_data[appliance]['hours'] = hours
-            with col5:
-                if st.button("🗑️", key=f"del_{appliance}", help="Remove appliance"):
-                    del st.session_state.appliances_data[appliance]
-                    st.experimental_rerun()
-            
-            if quantity > 0:
-                daily_kwh = (data['power'] * quantity * hours) / 1000
-                appliances_df.append({
-                    'Appliance': appliance,
-                    'Quantity': quantity,
-                    'Power (W)': data['power'],
-                    'Hours/Day': hours,
-                    'Daily kWh': round(daily_kwh, 2),
-                    'Priority': data['priority']
-                })
+        # Edits are batched in a form so the page reruns once per "Update", not per cell
+        with st.form("appliance_config", clear_on_submit=False):
+            config_df = pd.DataFrame(
+                [(appliance, data['quantity'], data['power'], data['hours'], data['priority'])
+                 for appliance, data in st.session_state.appliances_data.items()],
+                columns=["Appliance", "Qty", "Power (W)", "Hours/Day", "Priority"]
+            )
+            edited = st.data_editor(
+                config_df,
+                column_config={
+                    "Appliance": st.column_config.TextColumn(required=True),
+                    "Qty": st.column_config.NumberColumn(min_value=0, step=1, default=1),
+                    "Power (W)": st.column_config.NumberColumn(min_value=1, step=1, required=True),
+                    "Hours/Day": st.column_config.NumberColumn(min_value=0.0, max_value=24.0, step=0.1, default=4.0),
+                    "Priority": st.column_config.SelectboxColumn(options=list(PRIORITY_CODES), default="Medium")
+                },
+                num_rows="dynamic",
+                hide_index=True,
+                use_container_width=True,
+                key="appl_editor"
+            )
+            submitted = st.form_submit_button("Update")
+        
+        if submitted:
+            # Write edits back in one pass (rows deleted in the editor drop out here)
+            edited = edited.dropna(subset=["Appliance", "Power (W)"]).drop_duplicates("Appliance", keep="last")
+            edited = edited.fillna({"Qty": 1, "Hours/Day": 4.0, "Priority": "Medium"})
+            st.session_state.deleted |= set(st.session_state.appliances_data).difference(edited["Appliance"])
+            st.session_state.appliances_data = {
+                sys.intern(appliance): {
+                    'power': int(row['Power (W)']),
+                    'hours': float(row['Hours/Day']),
+                    'quantity': int(row['Qty']),
+                    'priority': row['Priority'],
+                    'priority_code': PRIORITY_CODES[row['Priority']]
+                }
+                for appliance, row in edited.set_index("Appliance").to_dict("index").items()
+            }
+        
+        # Fill column arrays by position, then build the summary frame in one call
+        n = len(st.session_state.appliances_data)
+        summary_names = np.empty(n, dtype=object)
+        summary_quantity = np.empty(n, dtype=np.int64)
+        summary_power = np.empty(n, dtype=np.int64)
+        summary_hours = np.empty(n, dtype=np.float64)
+        summary_priority = np.empty(n, dtype=object)
+        for i, (appliance, data) in enumerate(st.session_state.appliances_data.items()):
+            summary_names[i] = appliance
+            summary_quantity[i] = data['quantity']
+            summary_power[i] = data['power']
+            summary_hours[i] = data['hours']
+            summary_priority[i] = data['priority']
+        
+        df = pd.DataFrame({
+            'Appliance': summary_names,
+            'Quantity': summary_quantity,
+            'Power (W)': summary_power,
+            'Hours/Day': summary_hours,
+            'Daily kWh': np.round(summary_power * summary_quantity * summary_hours / 1000, 2),
+            'Priority': summary_priority
+        })
+        df = df[df['Quantity'] > 0].reset_index(drop=True)
         
         # Display summary table
-        if appliances_df:
-            df = pd.DataFrame(appliances_df)
+        if not df.empty:
             st.subheader("Load Summary")
             st.dataframe(df, use_container_width=True)
             
             # Visualization
-            fig = px.pie(df, values='Daily kWh', names='Appliance', 
-                        title="Daily Energy Consumption by Appliance")
+            fig = _consumption_pie(df)
             st.plotly_chart(fig, use_container_width=True)
 
 elif page == "☀️ Solar Sizing":
@@ -283,9 +526,6 @@ elif page == "☀️ Solar Sizing":
         st.warning("Please add appliances in the Load Calculator first!")
         st.stop()
     
-    # Calculate current consumption
-    total_watts, total_kwh = calculate_daily_consumption(st.session_state.appliances_data)
-    
     col1, col2 = st.columns([1, 1])
     
     with col1:
@@ -294,9 +534,9 @@ elif page == "☀️ Solar Sizing":
         autonomy_days = st.slider("Battery Backup Days", 1, 5, 2, 
                                  help="Number of days the system should run without sun")
         
-        # Calculate solar system requirements
-        required_kwp, battery_kwh, solar_irradiance = calculate_solar_system(
-            total_kwh, location, autonomy_days
+        # Calculate consumption and solar system requirements
+        total_watts, total_kwh, required_kwp, battery_kwh, solar_irradiance = calculate_system(
+            st.session_state.appliances_data, location, autonomy_days
         )
         
         st.subheader("Your Requirements")
@@ -308,12 +548,11 @@ elif page == "☀️ Solar Sizing":
     with col2:
         st.subheader("Solar Panel Recommendations")
         recommendations_df = recommend_panels(required_kwp)
-        st.dataframe(recommendations_df, use_container_width=True)
+        st.dataframe(recommendations_df, use_container_width=True,
+                     column_config={'_total_cost': None})
         
         # Cost comparison chart
-        fig = px.bar(recommendations_df, x='Panel Type', y='Cost per Watt (₦)',
-                    title="Cost Comparison per Watt")
-        fig.update_xaxes(tickangle=45)
+        fig = _cost_per_watt_bar(recommendations_df)
         st.plotly_chart(fig, use_container_width=True)
     
     # System overview
@@ -334,32 +573,24 @@ elif page == "☀️ Solar Sizing":
     
     with col2:
         # Additional components estimate
-        panel_cost = float(best_option['Total Cost (₦)'].replace('₦', '').replace(',', ''))
-        inverter_cost = required_kwp * 200000  # ₦200k per kW
-        battery_cost = battery_kwh * 150000    # ₦150k per kWh
-        installation_cost = panel_cost * 0.3   # 30% of panel cost
-        
-        total_system_cost = panel_cost + inverter_cost + battery_cost + installation_cost
+        costs = _compute_costs(total_kwh, required_kwp, battery_kwh, float(best_option['_total_cost']))
         
         st.info(f"""
         **System Cost Breakdown:**
-        - Panels: ₦{panel_cost:,.0f}
-        - Inverter: ₦{inverter_cost:,.0f}
-        - Batteries: ₦{battery_cost:,.0f}
-        - Installation: ₦{installation_cost:,.0f}
-        - **Total: ₦{total_system_cost:,.0f}**
+        - Panels: ₦{costs['panel']:,.0f}
+        - Inverter: ₦{costs['inverter']:,.0f}
+        - Batteries: ₦{costs['battery']:,.0f}
+        - Installation: ₦{costs['installation']:,.0f}
+        - **Total: ₦{costs['total']:,.0f}**
         """)
     
     with col3:
         # ROI calculation
-        monthly_savings = total_kwh * 30 * 100  # ₦100/kWh generator cost
-        payback_months = total_system_cost / monthly_savings
-        
         st.success(f"""
         **Return on Investment:**
-        - Monthly Savings: ₦{monthly_savings:,.0f}
-        - Payback Period: {payback_months:.1f} months
-        - 20-Year Savings: ₦{(monthly_savings * 240) - total_system_cost:,.0f}
+        - Monthly Savings: ₦{costs['monthly_savings']:,.0f}
+        - Payback Period: {costs['payback_months']:.1f} months
+        - 20-Year Savings: ₦{(costs['monthly_savings'] * 240) - costs['total']:,.0f}
         """)
 
 elif page == "⚖️ Load Optimization":
@@ -384,59 +615,31 @@ elif page == "⚖️ Load Optimization":
             if data['quantity'] > 0:
                 new_priority = st.selectbox(
                     f"{appliance}", 
-                    ["High", "Medium", "Low", "Remove"],
-                    index=["High", "Medium", "Low"].index(data['priority']),
-                    key=f"priority_{appliance}"
+                    list(PRIORITY_CODES),
+                    index=PRIORITY_CODES[data['priority']],
+                    key=_widget_key("priority", appliance)
                 )
                 st.session_state.appliances_data[appliance]['priority'] = new_priority
+                st.session_state.appliances_data[appliance]['priority_code'] = PRIORITY_CODES[new_priority]
     
     with col2:
         st.subheader("Optimization Results")
         
-        # Create scenarios based on priorities
-        scenarios = {
-            "Essential Only (High Priority)": ["High"],
-            "Essential + Important (High + Medium)": ["High", "Medium"],
-            "All Appliances": ["High", "Medium", "Low"]
-        }
-        
-        results = []
-        for scenario_name, priorities in scenarios.items():
-            scenario_appliances = {
-                appliance: data for appliance, data in st.session_state.appliances_data.items()
-                if data['priority'] in priorities and data['quantity'] > 0 and data['priority'] != "Remove"
-            }
-            
-            if scenario_appliances:
-                total_watts, total_kwh = calculate_daily_consumption(scenario_appliances)
-                required_kwp, battery_kwh, _ = calculate_solar_system(total_kwh, "Lagos")  # Default location
-                
-                # Estimate system cost
-                panel_cost = required_kwp * 300000  # Rough estimate
-                inverter_cost = required_kwp * 200000
-                battery_cost = battery_kwh * 150000
-                installation_cost = panel_cost * 0.3
-                total_cost = panel_cost + inverter_cost + battery_cost + installation_cost
-                
-                results.append({
-                    'Scenario': scenario_name,
-                    'Daily kWh': round(total_kwh, 2),
-                    'Solar kWp': round(required_kwp, 2),
-                    'Est. Cost (₦)': f"₦{total_cost:,.0f}",
-                    'Within Budget': "✅" if total_cost <= max_budget else "❌",
-                    'Monthly Savings': f"₦{total_kwh * 30 * 100:,.0f}"
-                })
+        # Keyed on an appliance snapshot so unrelated reruns hit the cache
+        appl_key = tuple(sorted(
+            (appliance, data['power'], data['hours'], data['quantity'], data['priority_code'])
+            for appliance, data in st.session_state.appliances_data.items()
+        ))
+        results = _optimization_scenarios(appl_key, max_budget)
         
         if results:
             results_df = pd.DataFrame(results)
-            st.dataframe(results_df, use_container_width=True)
+            st.dataframe(results_df, use_container_width=True,
+                         column_config={'_total_cost': None})
             
             # Visualization
-            costs = [float(cost.replace('₦', '').replace(',', '')) for cost in results_df['Est. Cost (₦)']]
-            fig = px.bar(x=results_df['Scenario'], y=costs, 
-                        title="System Cost by Scenario")
-            fig.add_hline(y=max_budget, line_dash="dash", line_color="red", 
-                         annotation_text="Budget Limit")
+            costs = results_df['_total_cost']
+            fig = _scenario_cost_bar(results_df['Scenario'], costs, max_budget)
             st.plotly_chart(fig, use_container_width=True)
         
         # Recommendations
@@ -460,11 +663,12 @@ elif page == "🏪 Find Vendors":
         st.subheader("Search Criteria")
         selected_city = st.selectbox("Select City", list(VENDORS.keys()))
         service_type = st.selectbox("Service Type", 
-                                   ["All", "Residential", "Commercial", "Off-grid Systems", "Hybrid Systems"])
+                                   ["All"] + VENDOR_SPECIALITIES)
         
         if st.session_state.appliances_data:
-            total_watts, total_kwh = calculate_daily_consumption(st.session_state.appliances_data)
-            required_kwp, _, _ = calculate_solar_system(total_kwh, selected_city)
+            total_watts, total_kwh, required_kwp, _, _ = calculate_system(
+                st.session_state.appliances_data, selected_city
+            )
             
             st.info(f"""
             **Your System Requirements:**
@@ -476,32 +680,29 @@ elif page == "🏪 Find Vendors":
     with col2:
         st.subheader(f"Solar Vendors in {selected_city}")
         
-        city_vendors = VENDORS.get(selected_city, [])
-        
-        for vendor in city_vendors:
-            if service_type == "All" or vendor['speciality'] == service_type:
-                with st.expander(f"⭐ {vendor['name']} - {vendor['rating']}/5.0"):
-                    col1, col2, col3 = st.columns(3)
-                    
-                    with col1:
-                        st.write(f"**Speciality:** {vendor['speciality']}")
-                        st.write(f"**Phone:** {vendor['phone']}")
-                    
-                    with col2:
-                        st.write(f"**Rating:** {'⭐' * int(vendor['rating'])} ({vendor['rating']}/5)")
-                        st.write(f"**Location:** {selected_city}")
-                    
-                    with col3:
-                        if st.button(f"Get Quote from {vendor['name']}", key=f"quote_{vendor['name']}"):
-                            st.success(f"""
-                            Quote request sent to {vendor['name']}!
-                            They will contact you at your provided number.
-                            
-                            **Your Requirements Shared:**
-                            - System Size: {required_kwp:.2f} kWp
-                            - Daily Energy: {total_kwh:.2f} kWh
-                            - Location: {selected_city}
-                            """)
+        for name, rating, phone, speciality, stars in _vendor_view(selected_city, service_type):
+            with st.expander(f"⭐ {name} - {rating}/5.0"):
+                col1, col2, col3 = st.columns(3)
+                
+                with col1:
+                    st.write(f"**Speciality:** {speciality}")
+                    st.write(f"**Phone:** {phone}")
+                
+                with col2:
+                    st.write(f"**Rating:** {stars} ({rating}/5)")
+                    st.write(f"**Location:** {selected_city}")
+                
+                with col3:
+                    if st.button(f"Get Quote from {name}", key=f"quote_{name}"):
+                        st.success(f"""
+                        Quote request sent to {name}!
+                        They will contact you at your provided number.
+                        
+                        **Your Requirements Shared:**
+                        - System Size: {required_kwp:.2f} kWp
+                        - Daily Energy: {total_kwh:.2f} kWh
+                        - Location: {selected_city}
+                        """)
         
         # Add new vendor form
         st.subheader("📝 Register Your Solar Business")
@@ -509,7 +710,7 @@ elif page == "🏪 Find Vendors":
             vendor_name = st.text_input("Business Name")
             vendor_phone = st.text_input("Phone Number")
             vendor_speciality = st.selectbox("Speciality", 
-                                           ["Residential", "Commercial", "Off-grid Systems", "Hybrid Systems"])
+                                           VENDOR_SPECIALITIES)
             vendor_city = st.selectbox("City", list(VENDORS.keys()))
             
             if st.form_submit_button("Register Business"):
@@ -527,9 +728,4 @@ elif page == "🏪 Find Vendors":
 
 # Footer
 st.markdown("---")
-st.markdown("""
-<div style='text-align: center; color: #666;'>
-    <p>SolarSize Nigeria - Empowering Solar Adoption Across Nigeria</p>
-    <p>Contact: amahagodspower@gmail.com | +234 7016323808 |+234-800-SOLAR-NG</p>
-</div>
-""", unsafe_allow_html=True)
+st.markdown(FOOTER_HTML, unsafe_allow_html=True)